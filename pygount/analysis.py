@@ -14,7 +14,7 @@ import os
 import re
 from enum import Enum
 from io import SEEK_CUR, BufferedIOBase, IOBase, RawIOBase, TextIOBase
-from typing import Iterator, List, Optional, Pattern, Sequence, Set, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Pattern, Sequence, Set, Tuple, Union
 
 import pygments.lexer
 import pygments.lexers
@@ -87,6 +87,9 @@ DEFAULT_GENERATED_PATTERNS_TEXT = pygount.common.REGEX_PATTERN_PREFIX + ", ".joi
     ]
 )
 
+#: Compiled regular expressions for :py:data:`DEFAULT_GENERATED_PATTERNS_TEXT`.
+_DEFAULT_GENERATED_REGEXES = pygount.common.regexes_from(DEFAULT_GENERATED_PATTERNS_TEXT)
+
 #: Default glob patterns for file names not to analyze.
 DEFAULT_NAME_PATTERNS_TO_SKIP_TEXT = ", ".join([".*", "*~"])
 
@@ -200,6 +203,18 @@ class SourceAnalysis:
     calling the constructor.
     """
 
+    __slots__ = (
+        "_code",
+        "_documentation",
+        "_empty",
+        "_group",
+        "_language",
+        "_path",
+        "_state",
+        "_state_info",
+        "_string",
+    )
+
     def __init__(
         self,
         path: str,
@@ -327,11 +342,7 @@ class SourceAnalysis:
             if result is None:
                 lexer = guess_lexer(source_path, source_code)
                 assert lexer is not None
-        actual_generated_regexes = (
-            generated_regexes
-            if generated_regexes is not None
-            else pygount.common.regexes_from(DEFAULT_GENERATED_PATTERNS_TEXT)
-        )
+        actual_generated_regexes = generated_regexes if generated_regexes is not None else _DEFAULT_GENERATED_REGEXES
         if (result is None) and (len(actual_generated_regexes) != 0):
             number_line_and_regex = matching_number_line_and_regex(
                 pygount.common.lines(source_code), actual_generated_regexes
@@ -717,6 +728,27 @@ def _pythonized_comments(tokens: Iterator[Tuple[TokenType, str]]) -> Iterator[To
         yield result_token_type, result_token_text
 
 
+def _token_type_mark(token_type: TokenType) -> str:
+    """
+    The mark for lines containing a token of ``token_type``: "d" for
+    documentation, "s" for string or "" if it depends on the token text.
+    """
+    # NOTE: Pygments treats preprocessor statements as special comments.
+    is_actual_comment = token_type in pygments.token.Comment and token_type not in (
+        pygments.token.Comment.Preproc,
+        pygments.token.Comment.PreprocFile,
+    )
+    if is_actual_comment:
+        return "d"  # 'documentation'
+    if token_type in pygments.token.String:
+        return "s"  # 'string'
+    return ""
+
+
+#: Cache for :py:func:`_token_type_mark`, which otherwise has to walk the token type hierarchy for each token.
+_TOKEN_TYPE_TO_MARK_MAP: Dict[TokenType, str] = {}
+
+
 def _line_parts(lexer: pygments.lexer.Lexer, text: str) -> Iterator[Set[str]]:
     line_marks = set()
     tokens = _delined_tokens(lexer.get_tokens(text))
@@ -726,15 +758,12 @@ def _line_parts(lexer: pygments.lexer.Lexer, text: str) -> Iterator[Set[str]]:
     white_text = " \f\n\r\t" + white_characters(language_id)
     white_words = white_code_words(language_id)
     for token_type, token_text in tokens:
-        # NOTE: Pygments treats preprocessor statements as special comments.
-        is_actual_comment = token_type in pygments.token.Comment and token_type not in (
-            pygments.token.Comment.Preproc,
-            pygments.token.Comment.PreprocFile,
-        )
-        if is_actual_comment:
-            line_marks.add("d")  # 'documentation'
-        elif token_type in pygments.token.String:
-            line_marks.add("s")  # 'string'
+        token_type_mark = _TOKEN_TYPE_TO_MARK_MAP.get(token_type)
+        if token_type_mark is None:
+            token_type_mark = _token_type_mark(token_type)
+            _TOKEN_TYPE_TO_MARK_MAP[token_type] = token_type_mark
+        if token_type_mark != "":
+            line_marks.add(token_type_mark)
         else:
             is_white_text = (token_text.strip() in white_words) or (token_text.rstrip(white_text) == "")
             if not is_white_text:
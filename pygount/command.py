@@ -26,6 +26,9 @@ _DEFAULT_OUTPUT = "STDOUT"
 _DEFAULT_SOURCE_PATTERNS = os.curdir
 _DEFAULT_SUFFIXES = "*"
 
+#: Size of the buffer for --out files, which receive many small writes from the writers.
+_OUTPUT_BUFFER_SIZE = 64 * 1024
+
 _HELP_ENCODING = '''encoding to use when reading source code; use "automatic"
  to take BOMs, XML prolog and magic headers into account and fall back to
  UTF-8 or CP1252 if none fits; use "automatic;<fallback>" to specify a
@@ -347,7 +350,7 @@ class Command:
             target_context_manager = (
                 contextlib.nullcontext(sys.stdout)
                 if is_stdout
-                else open(self.output, "w", encoding="utf-8", newline="")  # noqa: SIM115
+                else open(self.output, "w", buffering=_OUTPUT_BUFFER_SIZE, encoding="utf-8", newline="")  # noqa: SIM115
             )
             with target_context_manager as target_file, writer_class(target_file) as writer, Progress(
                 disable=not writer.has_to_track_progress, transient=True
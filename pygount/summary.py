@@ -5,14 +5,21 @@ Summaries of analyses of multiple source codes.
 # Copyright (c) 2016-2024, Thomas Aglassinger.
 # All rights reserved. Distributed under the BSD License.
 import functools
+import operator
 import re
-from typing import Dict, Hashable
+import sys
+from typing import Dict, Hashable, Iterable, Sequence, Tuple
 
 from .analysis import SourceAnalysis
 from .common import mapped_repr
 
 _PSEUDO_LANGUAGE_REGEX = re.compile("^__[a-z]+__$")
 
+#: Getter to obtain all values a summary needs from a :py:class:`SourceAnalysis` with a single call.
+_GET_COUNTS = operator.attrgetter(
+    "code_count", "documentation_count", "empty_count", "string_count", "is_countable", "language"
+)
+
 
 @functools.total_ordering
 class LanguageSummary:
@@ -20,16 +27,35 @@ class LanguageSummary:
     Summary of a source code counts from multiple files of the same language.
     """
 
+    __slots__ = (
+        "_code_count",
+        "_documentation_count",
+        "_empty_count",
+        "_file_count",
+        "_file_percentage",
+        "_has_up_to_date_percentages",
+        "_is_pseudo_language",
+        "_language",
+        "_line_count",
+        "_repr",
+        "_string_count",
+    )
+
     def __init__(self, language: str):
-        self._language = language
+        # NOTE: Interning the language allows dictionaries using it as key to
+        #  often match by identity without comparing characters. Because
+        #  sys.intern() rejects subclasses of str like numpy.str_, convert first.
+        self._language = sys.intern(str(language))
         self._code_count = 0
         self._documentation_count = 0
         self._empty_count = 0
         self._file_count = 0
         self._file_percentage = 0.0
+        self._line_count = 0
         self._string_count = 0
-        self._is_pseudo_language = _PSEUDO_LANGUAGE_REGEX.match(self.language) is not None
+        self._is_pseudo_language = _is_pseudo_language(language)
         self._has_up_to_date_percentages = False
+        self._repr = None
 
     @property
     def language(self) -> str:
@@ -44,7 +70,8 @@ class LanguageSummary:
     @property
     def code_percentage(self) -> float:
         """percentage of lines containing code for this language across entire project"""
-        return _percentage_or_0(self.code_count, self.line_count)
+        line_count = self._line_count
+        return 100 * self._code_count / line_count if line_count != 0 else 0.0
 
     def _assert_has_up_to_date_percentages(self):
         assert self._has_up_to_date_percentages, "update_percentages() must be called first"
@@ -57,7 +84,8 @@ class LanguageSummary:
     @property
     def documentation_percentage(self) -> float:
         """percentage of lines containing documentation for this language across entire project"""
-        return _percentage_or_0(self.documentation_count, self.line_count)
+        line_count = self._line_count
+        return 100 * self._documentation_count / line_count if line_count != 0 else 0.0
 
     @property
     def empty_count(self) -> int:
@@ -67,7 +95,8 @@ class LanguageSummary:
     @property
     def empty_percentage(self) -> float:
         """percentage of empty lines for this language across entire project"""
-        return _percentage_or_0(self.empty_count, self.line_count)
+        line_count = self._line_count
+        return 100 * self._empty_count / line_count if line_count != 0 else 0.0
 
     @property
     def file_count(self) -> int:
@@ -83,7 +112,7 @@ class LanguageSummary:
     @property
     def line_count(self) -> int:
         """sum count of all lines of any kind for this language"""
-        return self.code_count + self.documentation_count + self.empty_count + self.string_count
+        return self._line_count
 
     @property
     def string_count(self) -> int:
@@ -93,7 +122,8 @@ class LanguageSummary:
     @property
     def string_percentage(self) -> float:
         """percentage of lines containing strings for this language across entire project"""
-        return _percentage_or_0(self.string_count, self.line_count)
+        line_count = self._line_count
+        return 100 * self._string_count / line_count if line_count != 0 else 0.0
 
     @property
     def source_count(self) -> int:
@@ -103,7 +133,8 @@ class LanguageSummary:
     @property
     def source_percentage(self) -> float:
         """percentage of source lines for code for this language across entire project"""
-        return _percentage_or_0(self.source_count, self.line_count)
+        line_count = self._line_count
+        return 100 * (self._code_count + self._string_count) / line_count if line_count != 0 else 0.0
 
     @property
     def is_pseudo_language(self) -> bool:
@@ -112,7 +143,7 @@ class LanguageSummary:
 
     def sort_key(self) -> Hashable:
         """sort key to sort multiple languages by importance"""
-        return self.code_count, self.documentation_count, self.string_count, self.empty_count, self.language
+        return self._code_count, self._documentation_count, self._string_count, self._empty_count, self._language
 
     def __eq__(self, other):
         return self.sort_key() == other.sort_key()
@@ -123,46 +154,73 @@ class LanguageSummary:
     def add(self, source_analysis: SourceAnalysis) -> None:
         """
         Add counts from ``source_analysis`` to total counts for this language.
+
+        The ``source_analysis.language`` must match :py:attr:`language`. This
+        is not checked because :py:meth:`ProjectSummary.add()` already routes
+        each analysis to the summary of its language.
         """
-        assert source_analysis is not None
-        assert source_analysis.language == self.language
+        code_count, documentation_count, empty_count, string_count, is_countable, _ = _GET_COUNTS(source_analysis)
+        self._add_counts(
+            is_countable,
+            code_count,
+            documentation_count,
+            empty_count,
+            string_count,
+            code_count + documentation_count + empty_count + string_count,
+        )
 
+    def _add_counts(
+        self,
+        is_countable: bool,
+        code_count: int,
+        documentation_count: int,
+        empty_count: int,
+        string_count: int,
+        line_count: int,
+    ) -> None:
+        # NOTE: The caller passes the already summed up line_count to avoid
+        #  computing it twice for both the language and the project.
         self._has_up_to_date_percentages = False
+        self._repr = None
         self._file_count += 1
-        if source_analysis.is_countable:
-            self._code_count += source_analysis.code_count
-            self._documentation_count += source_analysis.documentation_count
-            self._empty_count += source_analysis.empty_count
-            self._string_count += source_analysis.string_count
+        if is_countable:
+            self._code_count += code_count
+            self._documentation_count += documentation_count
+            self._empty_count += empty_count
+            self._line_count += line_count
+            self._string_count += string_count
 
     def update_file_percentage(self, project_summary: "ProjectSummary"):
-        self._file_percentage = _percentage_or_0(self.file_count, project_summary.total_file_count)
+        total_file_count = project_summary.total_file_count
+        self._file_percentage = 100 * self._file_count / total_file_count if total_file_count != 0 else 0.0
         self._has_up_to_date_percentages = True
 
     def __repr__(self):
-        name_to_value_map = {
-            "language": f"{self.language!r}",
-            "file_count": self.file_count,
-        }
-        if not self.is_pseudo_language:
-            name_to_value_map.update(
-                {
-                    "code_count": self.code_count,
-                    "documentation_count": self.documentation_count,
-                    "empty_count": self.empty_count,
-                    "string_count": self.string_count,
-                }
-            )
-        return mapped_repr(self, name_to_value_map)
-        result = ", ".join(f"{name}={value}" for name, value in name_to_value_map.items())
-        result = f"{self.__class__.__name__}({result})"
-        return result
-
-
-def _percentage_or_0(partial_count: int, total_count: int) -> float:
-    assert partial_count >= 0
-    assert total_count >= 0
-    return 100 * partial_count / total_count if total_count != 0 else 0.0
+        # NOTE: The representation is cached until the next add() because
+        #  summaries might be logged many times, for example to show progress.
+        if self._repr is None:
+            name_to_value_map = {
+                "language": f"{self.language!r}",
+                "file_count": self.file_count,
+            }
+            if not self.is_pseudo_language:
+                name_to_value_map.update(
+                    {
+                        "code_count": self.code_count,
+                        "documentation_count": self.documentation_count,
+                        "empty_count": self.empty_count,
+                        "string_count": self.string_count,
+                    }
+                )
+            self._repr = mapped_repr(self, name_to_value_map)
+        return self._repr
+
+
+@functools.lru_cache(maxsize=256)
+def _is_pseudo_language(language: str) -> bool:
+    # NOTE: The number of different languages is small, so cache the result
+    #  across all summaries created during the lifetime of the process.
+    return _PSEUDO_LANGUAGE_REGEX.match(language) is not None
 
 
 class ProjectSummary:
@@ -178,6 +236,7 @@ class ProjectSummary:
         self._total_string_count = 0
         self._total_file_count = 0
         self._total_line_count = 0
+        self._repr = None
 
     @property
     def language_to_language_summary_map(self) -> Dict[str, LanguageSummary]:
@@ -192,7 +251,8 @@ class ProjectSummary:
 
     @property
     def total_code_percentage(self) -> float:
-        return _percentage_or_0(self.total_code_count, self.total_line_count)
+        total_line_count = self._total_line_count
+        return 100 * self._total_code_count / total_line_count if total_line_count != 0 else 0.0
 
     @property
     def total_documentation_count(self) -> int:
@@ -200,7 +260,8 @@ class ProjectSummary:
 
     @property
     def total_documentation_percentage(self) -> float:
-        return _percentage_or_0(self.total_documentation_count, self.total_line_count)
+        total_line_count = self._total_line_count
+        return 100 * self._total_documentation_count / total_line_count if total_line_count != 0 else 0.0
 
     @property
     def total_empty_count(self) -> int:
@@ -208,7 +269,8 @@ class ProjectSummary:
 
     @property
     def total_empty_percentage(self) -> float:
-        return _percentage_or_0(self.total_empty_count, self.total_line_count)
+        total_line_count = self._total_line_count
+        return 100 * self._total_empty_count / total_line_count if total_line_count != 0 else 0.0
 
     @property
     def total_file_count(self) -> int:
@@ -224,7 +286,9 @@ class ProjectSummary:
 
     @property
     def total_source_percentage(self) -> float:
-        return _percentage_or_0(self.total_source_count, self.total_line_count)
+        total_line_count = self._total_line_count
+        total_source_count = self._total_code_count + self._total_string_count
+        return 100 * total_source_count / total_line_count if total_line_count != 0 else 0.0
 
     @property
     def total_string_count(self) -> int:
@@ -232,30 +296,123 @@ class ProjectSummary:
 
     @property
     def total_string_percentage(self) -> float:
-        return _percentage_or_0(self.total_string_count, self.total_line_count)
+        total_line_count = self._total_line_count
+        return 100 * self._total_string_count / total_line_count if total_line_count != 0 else 0.0
 
     def add(self, source_analysis: SourceAnalysis) -> None:
         """
         Add counts from ``source_analysis`` to total counts.
         """
+        code_count, documentation_count, empty_count, string_count, is_countable, language = _GET_COUNTS(
+            source_analysis
+        )
+        line_count = code_count + documentation_count + empty_count + string_count
+        self._repr = None
         self._total_file_count += 1
-        language_summary = self.language_to_language_summary_map.get(source_analysis.language)
+        language_summary = self._language_to_language_summary_map.get(language)
         if language_summary is None:
-            language_summary = LanguageSummary(source_analysis.language)
-            self.language_to_language_summary_map[source_analysis.language] = language_summary
-        language_summary.add(source_analysis)
-
-        if source_analysis.is_countable:
-            self._total_code_count += source_analysis.code_count
-            self._total_documentation_count += source_analysis.documentation_count
-            self._total_empty_count += source_analysis.empty_count
-            self._total_line_count += (
-                source_analysis.code_count
-                + source_analysis.documentation_count
-                + source_analysis.empty_count
-                + source_analysis.string_count
-            )
-            self._total_string_count += source_analysis.string_count
+            language_summary = LanguageSummary(language)
+            self._language_to_language_summary_map[language_summary.language] = language_summary
+        language_summary._add_counts(  # noqa: SLF001
+            is_countable, code_count, documentation_count, empty_count, string_count, line_count
+        )
+
+        if is_countable:
+            self._total_code_count += code_count
+            self._total_documentation_count += documentation_count
+            self._total_empty_count += empty_count
+            self._total_line_count += line_count
+            self._total_string_count += string_count
+
+    def add_many(self, source_analyses: Iterable[SourceAnalysis]) -> None:
+        """
+        Add counts from all ``source_analyses`` to total counts.
+
+        This has the same result as calling :py:meth:`add()` for each of them
+        but is faster for many source analyses.
+        """
+        self._add_many_counts(map(_GET_COUNTS, source_analyses))
+
+    @classmethod
+    def from_arrays(
+        cls,
+        code_counts: Sequence[int],
+        documentation_counts: Sequence[int],
+        empty_counts: Sequence[int],
+        string_counts: Sequence[int],
+        countables: Sequence[bool],
+        languages: Sequence[str],
+    ) -> "ProjectSummary":
+        """
+        Project summary for files described by parallel sequences, where the
+        values at the same index describe the same file. This is useful for
+        very large projects where counts are already available in a columnar
+        form, for example as arrays or table columns, and avoids creating a
+        :py:class:`SourceAnalysis` for each file.
+
+        :raises ValueError: if the sequences differ in length
+        """
+        file_count = len(languages)
+        for name, values in (
+            ("code_counts", code_counts),
+            ("documentation_counts", documentation_counts),
+            ("empty_counts", empty_counts),
+            ("string_counts", string_counts),
+            ("countables", countables),
+        ):
+            if len(values) != file_count:
+                raise ValueError(f"{name} must have the same length as languages ({file_count}) but has {len(values)}")
+
+        result = cls()
+        result._add_many_counts(  # noqa: SLF001
+            zip(code_counts, documentation_counts, empty_counts, string_counts, countables, languages)
+        )
+        return result
+
+    def _add_many_counts(self, counts_and_languages: Iterable[Tuple[int, int, int, int, bool, str]]) -> None:
+        # NOTE: The totals are accumulated in local variables so the loop does not
+        #  have to look up and store attributes for each file.
+        language_to_language_summary_map = self._language_to_language_summary_map
+        total_code_count = self._total_code_count
+        total_documentation_count = self._total_documentation_count
+        total_empty_count = self._total_empty_count
+        total_file_count = self._total_file_count
+        total_line_count = self._total_line_count
+        total_string_count = self._total_string_count
+        try:
+            for (
+                code_count,
+                documentation_count,
+                empty_count,
+                string_count,
+                is_countable,
+                language,
+            ) in counts_and_languages:
+                total_file_count += 1
+                language_summary = language_to_language_summary_map.get(language)
+                if language_summary is None:
+                    language_summary = LanguageSummary(language)
+                    language_to_language_summary_map[language_summary.language] = language_summary
+                line_count = code_count + documentation_count + empty_count + string_count
+                language_summary._add_counts(  # noqa: SLF001
+                    is_countable, code_count, documentation_count, empty_count, string_count, line_count
+                )
+                if is_countable:
+                    total_code_count += code_count
+                    total_documentation_count += documentation_count
+                    total_empty_count += empty_count
+                    total_line_count += line_count
+                    total_string_count += string_count
+        finally:
+            # Keep the totals consistent with the language summaries even if
+            # the iteration of counts_and_languages fails.
+            self._total_code_count = total_code_count
+            self._total_documentation_count = total_documentation_count
+            self._total_empty_count = total_empty_count
+            self._total_file_count = total_file_count
+            self._total_line_count = total_line_count
+            self._total_string_count = total_string_count
+            self._repr = None
 
     def update_file_percentages(self) -> None:
         """Update percentages for all languages part of the project."""
@@ -263,9 +420,12 @@ class ProjectSummary:
             language_summary.update_file_percentage(self)
 
     def __repr__(self):
-        return (
-            f"{self.__class__.__name__}("
-            f"total_file_count={self.total_file_count}, "
-            f"total_line_count={self.total_line_count}, "
-            f"languages={sorted(self.language_to_language_summary_map.keys())})"
-        )
+        # NOTE: Similar to LanguageSummary, the representation is cached until the next add().
+        if self._repr is None:
+            self._repr = (
+                f"{self.__class__.__name__}("
+                f"total_file_count={self.total_file_count}, "
+                f"total_line_count={self.total_line_count}, "
+                f"languages={sorted(self.language_to_language_summary_map.keys())})"
+            )
+        return self._repr
@@ -5,10 +5,15 @@ Writers to store the results of a pygount analysis.
 # Copyright (c) 2016-2024, Thomas Aglassinger.
 # All rights reserved. Distributed under the BSD License.
 import datetime
+import functools
 import json
-import math
 import os
-from xml.etree import ElementTree
+import re
+import shutil
+import sys
+import tempfile
+import time
+from xml.sax.saxutils import escape, quoteattr
 
 from rich.console import Console
 from rich.table import Table
@@ -16,13 +21,19 @@ from rich.table import Table
 import pygount
 
 from . import SourceAnalysis
-from .summary import ProjectSummary
+from .summary import LanguageSummary, ProjectSummary
 
 #: Version of cloc the --format=cloc-xml pretends to be.
 CLOC_VERSION = "1.60"
 
 JSON_FORMAT_VERSION = "1.1.0"
 
+#: Maximum number of characters of ``<file>`` elements to keep in memory before spooling them to a temporary file.
+_CLOC_XML_FILES_MAX_MEMORY_SIZE = 1024 * 1024
+
+#: Characters that require :py:func:`xml.sax.saxutils.quoteattr` to escape an XML attribute value.
+_XML_ATTRIBUTE_SPECIAL_CHARACTERS_REGEX = re.compile('[\t\n\r"&<>]')
+
 
 class BaseWriter:
     def __init__(self, target_stream):
@@ -33,12 +44,16 @@ class BaseWriter:
             self.target_name = "<io>"
         self.project_summary = ProjectSummary()
         self.started_at = self._utc_now()
+        self._started_at_perf_counter = time.perf_counter()
         self.finished_at = None
         self.files_per_second = 0
         self.lines_per_second = 0
         self.duration = None
         self.duration_in_seconds = 0.0
         self.has_to_track_progress = True
+        # NOTE: Writers that write to the target before close() must not track
+        #  progress on stdout because the progress bar would clobber the output.
+        self._is_target_stdout = target_stream is sys.stdout or target_stream is sys.__stdout__
 
     def __enter__(self):
         return self
@@ -53,10 +68,9 @@ class BaseWriter:
     def close(self):
         self.project_summary.update_file_percentages()
         self.finished_at = self._utc_now()
-        self.duration = self.finished_at - self.started_at
-        self.duration_in_seconds = max(
-            0.001, self.duration.microseconds * 1e-6 + self.duration.seconds + self.duration.days * 3600 * 24
-        )
+        # NOTE: Unlike the wall clock, perf_counter() is meant to measure durations.
+        self.duration_in_seconds = max(0.001, time.perf_counter() - self._started_at_perf_counter)
+        self.duration = datetime.timedelta(seconds=self.duration_in_seconds)
         self.lines_per_second = self.project_summary.total_line_count / self.duration_in_seconds
         self.files_per_second = self.project_summary.total_file_count / self.duration_in_seconds
 
@@ -71,17 +85,31 @@ class LineWriter(BaseWriter):
     Writer that simply writes a line of text for each source code.
     """
 
+    #: Number of lines to collect before writing them to the target stream at once.
+    LINES_PER_WRITE = 4096
+
     def __init__(self, target_stream):
         super().__init__(target_stream)
         self.has_to_track_progress = False
-        self.template = "{0}\t{1}\t{2}\t{3}"
+        self._pending_lines = []
 
     def add(self, source_analysis):
         source_line_count = source_analysis.code_count + source_analysis.string_count
-        line_to_write = self.template.format(
-            source_line_count, source_analysis.language, source_analysis.group, source_analysis.path
+        self._pending_lines.append(
+            f"{source_line_count}\t{source_analysis.language}\t{source_analysis.group}\t{source_analysis.path}"
         )
-        self._target_stream.write(line_to_write + os.linesep)
+        if len(self._pending_lines) >= LineWriter.LINES_PER_WRITE:
+            self._write_pending_lines()
+
+    def close(self):
+        self._write_pending_lines()
+        super().close()
+
+    def _write_pending_lines(self):
+        # NOTE: Few large writes are considerably faster than many small ones.
+        if self._pending_lines:
+            self._target_stream.write(os.linesep.join(self._pending_lines) + os.linesep)
+        self._pending_lines.clear()
 
 
 class ClocXmlWriter(BaseWriter):
@@ -89,56 +117,73 @@ class ClocXmlWriter(BaseWriter):
     Writer that writes XML output similar to cloc when called with options
     --by-file --xml. This kind of output can be processed by Jenkins' SLOCCount
     plug-in.
+
+    To keep the memory consumption independent of the number of files, each
+    ``<file>`` is spooled to a temporary file as soon as it is added. The
+    spooled elements are copied to the target after the ``<header>``, whose
+    statistics are only available after all files have been added.
     """
 
     def __init__(self, target_stream):
         super().__init__(target_stream)
-        self._results_element = ElementTree.Element("results")
-        self._header_element = ElementTree.SubElement(self._results_element, "header")
-        ElementTree.SubElement(self._header_element, "cloc_url", text="https://github.com/roskakori/pygount")
-        ElementTree.SubElement(self._header_element, "cloc_version", text=CLOC_VERSION)
-        self._files_element = ElementTree.SubElement(self._results_element, "files")
+        # NOTE: Paths of files with names that are not valid UTF-8 contain
+        #  surrogates, which must survive spooling to disk.
+        self._files_stream = tempfile.SpooledTemporaryFile(
+            max_size=_CLOC_XML_FILES_MAX_MEMORY_SIZE, mode="w+", encoding="utf-8", errors="surrogateescape"
+        )
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if exc_type is None:
             # Only write the XML if everything works out.
             self.close()
+        else:
+            self._files_stream.close()
 
     def add(self, source_analysis: SourceAnalysis):
         super().add(source_analysis)
-        file_attributes = {
-            "blank": str(source_analysis.empty_count),
-            "code": str(source_analysis.source_count),
-            "comment": str(source_analysis.documentation_count),
-            "language": source_analysis.language,
-            "name": source_analysis.path,
-        }
-        ElementTree.SubElement(self._files_element, "file", attrib=file_attributes)
+        # NOTE: Writing the markup directly allows to reuse the escaped
+        #  language names, of which there are only a few compared to the number
+        #  of files.
+        self._files_stream.write(
+            f'<file blank="{source_analysis.empty_count}" code="{source_analysis.source_count}"'
+            f' comment="{source_analysis.documentation_count}" language={_quoted_language(source_analysis.language)}'
+            f" name={_quoted_xml_attribute(source_analysis.path)}/>"
+        )
 
     def close(self):
+        if self._files_stream.closed:
+            # The XML has already been written by an earlier close().
+            return
         super().close()
+        encoding = self._target_stream.encoding
+        if encoding is not None:
+            # Write XML declaration only for files but skip it for io.StringIO.
+            self._target_stream.write(f'<?xml version="1.0" encoding="{encoding}"?>')
+
         # Add various statistics to <header>.
-        ElementTree.SubElement(self._header_element, "elapsed_seconds", text=str(self.duration_in_seconds))
-        ElementTree.SubElement(self._header_element, "n_files", text=str(self.project_summary.total_file_count))
-        ElementTree.SubElement(self._header_element, "n_lines", text=str(self.project_summary.total_line_count))
-        ElementTree.SubElement(self._header_element, "files_per_second", text=f"{self.files_per_second:f}")
-        ElementTree.SubElement(self._header_element, "lines_per_second", text=f"{self.lines_per_second:f}")
-        ElementTree.SubElement(self._header_element, "report_file", text=self.target_name)
+        self._target_stream.write(
+            "<results><header>"
+            "<cloc_url>https://github.com/roskakori/pygount</cloc_url>"
+            f"<cloc_version>{CLOC_VERSION}</cloc_version>"
+            f"<elapsed_seconds>{self.duration_in_seconds}</elapsed_seconds>"
+            f"<n_files>{self.project_summary.total_file_count}</n_files>"
+            f"<n_lines>{self.project_summary.total_line_count}</n_lines>"
+            f"<files_per_second>{self.files_per_second:f}</files_per_second>"
+            f"<lines_per_second>{self.lines_per_second:f}</lines_per_second>"
+            f"<report_file>{escape(self.target_name)}</report_file>"
+            "</header><files>"
+        )
 
+        with self._files_stream:
+            self._files_stream.seek(0)
+            shutil.copyfileobj(self._files_stream, self._target_stream)
         # Add totals to <files>.
-        file_attributes = {
-            "blank": str(self.project_summary.total_empty_count),
-            "code": str(self.project_summary.total_code_count + self.project_summary.total_string_count),
-            "comment": str(self.project_summary.total_documentation_count),
-        }
-        ElementTree.SubElement(self._files_element, "total", attrib=file_attributes)
-
-        # Write the whole XML file.
-        if self._target_stream.encoding is not None:
-            # Write XML declaration only for files but skip it for io.StringIO.
-            self._target_stream.write(f'<?xml version="1.0" encoding="{self._target_stream.encoding}"?>')
-        xml_root = ElementTree.ElementTree(self._results_element)
-        xml_root.write(self._target_stream, encoding="unicode", xml_declaration=False)
+        self._target_stream.write(
+            f'<total blank="{self.project_summary.total_empty_count}"'
+            f' code="{self.project_summary.total_code_count + self.project_summary.total_string_count}"'
+            f' comment="{self.project_summary.total_documentation_count}"/>'
+            "</files></results>"
+        )
 
 
 class SummaryWriter(BaseWriter):
@@ -164,9 +209,13 @@ class SummaryWriter(BaseWriter):
         for column, justify in self._COLUMNS_WITH_JUSTIFY:
             table.add_column(column, justify=justify, overflow="fold")
 
-        language_summaries = sorted(self.project_summary.language_to_language_summary_map.values(), reverse=True)
-        for index, language_summary in enumerate(language_summaries, start=1):
-            table.add_row(
+        # NOTE: Using sort_key() as key computes it only once per language
+        #  instead of twice per comparison.
+        language_summaries = sorted(
+            self.project_summary.language_to_language_summary_map.values(), key=LanguageSummary.sort_key, reverse=True
+        )
+        language_rows = [
+            (
                 language_summary.language,
                 str(language_summary.file_count),
                 formatted_percentage(language_summary.file_percentage),
@@ -174,8 +223,12 @@ class SummaryWriter(BaseWriter):
                 formatted_percentage(language_summary.code_percentage),
                 str(language_summary.documentation_count),
                 formatted_percentage(language_summary.documentation_percentage),
-                end_section=(index == len(language_summaries)),
             )
+            for language_summary in language_summaries
+        ]
+        language_row_count = len(language_rows)
+        for index, language_row in enumerate(language_rows, start=1):
+            table.add_row(*language_row, end_section=(index == language_row_count))
         table.add_row(
             "Sum",
             str(self.project_summary.total_file_count),
@@ -195,33 +248,50 @@ class JsonWriter(BaseWriter):
 
     def __init__(self, target_stream):
         super().__init__(target_stream)
-        self.source_analyses = []
+        self.has_to_track_progress = not self._is_target_stdout
+        self._has_files = False
+        # NOTE: To keep the memory consumption independent of the number of
+        #  files, each file is written as soon as it is added.
+        self._target_stream.write(
+            f'{{"formatVersion": {json.dumps(JSON_FORMAT_VERSION)}, '
+            f'"pygountVersion": {json.dumps(pygount.__version__)}, '
+            '"files": ['
+        )
 
     def add(self, source_analysis: SourceAnalysis):
         super().add(source_analysis)
-        self.source_analyses.append(
+        # NOTE: Reusing the counts is cheaper than the properties line_count and
+        #  source_count, which would read them again.
+        code_count = source_analysis.code_count
+        documentation_count = source_analysis.documentation_count
+        empty_count = source_analysis.empty_count
+        string_count = source_analysis.string_count
+        source_count = code_count + string_count
+        if self._has_files:
+            self._target_stream.write(", ")
+        else:
+            self._has_files = True
+        json.dump(
             {
-                "codeCount": source_analysis.code_count,
-                "documentationCount": source_analysis.documentation_count,
-                "emptyCount": source_analysis.empty_count,
+                "codeCount": code_count,
+                "documentationCount": documentation_count,
+                "emptyCount": empty_count,
                 "group": source_analysis.group,
                 "isCountable": source_analysis.is_countable,
                 "language": source_analysis.language,
-                "lineCount": source_analysis.line_count,
+                "lineCount": source_count + documentation_count + empty_count,
                 "path": source_analysis.path,
                 "state": source_analysis.state.name,
                 "stateInfo": source_analysis.state_info,
-                "sourceCount": source_analysis.source_count,
-            }
+                "sourceCount": source_count,
+            },
+            self._target_stream,
         )
 
     def close(self):
         # NOTE: JSON names use camel case to follow JSLint's guidelines, see <https://www.jslint.com/>.
         super().close()
         json_map = {
-            "formatVersion": JSON_FORMAT_VERSION,
-            "pygountVersion": pygount.__version__,
-            "files": self.source_analyses,
             "languages": [
                 {
                     "documentationCount": language_summary.documentation_count,
@@ -262,12 +332,24 @@ class JsonWriter(BaseWriter):
                 "totalStringPercentage": self.project_summary.total_string_percentage,
             },
         }
-        json.dump(json_map, self._target_stream)
+        # NOTE: Omit the opening brace because the map was already started in __init__().
+        self._target_stream.write("], ")
+        self._target_stream.write(json.dumps(json_map)[1:])
+
+
+def _quoted_xml_attribute(value: str) -> str:
+    # NOTE: Most values need no escaping, so checking first is cheaper than always escaping.
+    return f'"{value}"' if _XML_ATTRIBUTE_SPECIAL_CHARACTERS_REGEX.search(value) is None else quoteattr(value)
+
+
+@functools.lru_cache(maxsize=256)
+def _quoted_language(language: str) -> str:
+    return _quoted_xml_attribute(language)
 
 
 def digit_width(line_count: int) -> int:
     assert line_count >= 0
-    return math.ceil(math.log10(line_count + 1)) if line_count != 0 else 1
+    return len(str(line_count))
 
 
 def formatted_percentage(percentage: float) -> str:
@@ -6,19 +6,34 @@ Function to obtain the language dialect used by XML source code.
 # All rights reserved. Distributed under the BSD License.
 import logging
 import re
+import xml.parsers.expat
 import xml.sax
 
 # TODO #10: Replace regex for DTD by working DTD handler.
 #: Regular expression to obtain DTD.
 _DTD_REGEX = re.compile(r'<!DOCTYPE\s+(?P<name>[a-zA-Z][a-zA-Z-]*)\s+PUBLIC\s+"(?P<public_id>.+)"')
 _REGEX_PATTERNS_AND_DIALECTS = ((".*DocBook.*", "DocBook XML"),)
+#: Element paths that indicate DocBook.
+_DOCBOOK_TITLE_PATHS = frozenset(("/book/title", "/chapter/title"))
+#: Maximum number of names in an element path that can indicate a dialect.
+_MAX_DIALECT_PATH_DEPTH = 2
+#: Namespaces that indicate a dialect.
+_XMLNS_TO_DIALECT_MAP = {
+    "http://docbook.org/ns/docbook": "DocBook XML",
+    "http://xmlns.jcp.org/xml/ns/javaee": "JavaEE XML",
+}
+#: Prefixes of namespaces that indicate a dialect.
+_XMLNS_PREFIXES_AND_DIALECTS = (
+    ("http://maven.apache.org/POM", "Maven"),
+    ("http://www.netbeans.org/ns/project/", "NetBeans Project"),
+)
+#: Texts of which at least one must be part of the XML code for XmlDialectHandler to detect a dialect.
+_DIALECT_MARKERS = ("xmlns", "<project", "<book", "<chapter")
 _REGEXES_AND_DIALECTS = [(re.compile(pattern), dialect) for pattern, dialect in _REGEX_PATTERNS_AND_DIALECTS]
 for public_id_regex, dialect in _REGEX_PATTERNS_AND_DIALECTS:
     assert public_id_regex is not None
     assert dialect is not None
     assert dialect.strip() != ""
-#: Regex to detect Sax error messages with uninformative paths like '<unknown>'.
-_SAX_MESSAGE_WITHOUT_PATH_PATTERN = re.compile(r"^<.+>(?P<message_without_path>:\d+:\d+.+)")
 
 _log = logging.getLogger("pygount")
 
@@ -33,7 +48,7 @@ class XmlDialectHandler(xml.sax.ContentHandler, xml.sax.handler.DTDHandler):
     def __init__(self, max_element_count=100):
         super().__init__()
         self.dialect = None
-        self._path = ""
+        self._path_names = []
         self._element_count = 0
         self._max_element_count = max_element_count
 
@@ -45,21 +60,27 @@ class XmlDialectHandler(xml.sax.ContentHandler, xml.sax.handler.DTDHandler):
         self._element_count += 1
         if self._element_count == self._max_element_count:
             raise SaxParserDone(f"no language found after parsing {self._element_count} elements")
-        self._path += "/" + name
-        xmlns = attrs.get("xmlns", "")
-        if (self._path == "/project") and ("name" in attrs):
-            self._set_dialect_and_stop_parsing("Ant")
-        elif (self._path in ("/book/title", "/chapter/title")) or (xmlns == "http://docbook.org/ns/docbook"):
-            self._set_dialect_and_stop_parsing("DocBook XML")
-        elif xmlns == "http://xmlns.jcp.org/xml/ns/javaee":
-            self._set_dialect_and_stop_parsing("JavaEE XML")
-        elif xmlns.startswith("http://maven.apache.org/POM"):
-            self._set_dialect_and_stop_parsing("Maven")
-        elif xmlns.startswith("http://www.netbeans.org/ns/project/"):
-            self._set_dialect_and_stop_parsing("NetBeans Project")
+        path_names = self._path_names
+        path_names.append(name)
+        # NOTE: Only the paths of the topmost elements can indicate a dialect,
+        #  so there is no need to build the path for deeper elements.
+        if len(path_names) <= _MAX_DIALECT_PATH_DEPTH:
+            path = "/" + "/".join(path_names)
+            if (path == "/project") and ("name" in attrs):
+                self._set_dialect_and_stop_parsing("Ant")
+            if path in _DOCBOOK_TITLE_PATHS:
+                self._set_dialect_and_stop_parsing("DocBook XML")
+        xmlns = attrs.get("xmlns")
+        if xmlns is not None:
+            dialect = _XMLNS_TO_DIALECT_MAP.get(xmlns)
+            if dialect is not None:
+                self._set_dialect_and_stop_parsing(dialect)
+            for xmlns_prefix, dialect in _XMLNS_PREFIXES_AND_DIALECTS:
+                if xmlns.startswith(xmlns_prefix):
+                    self._set_dialect_and_stop_parsing(dialect)
 
     def endElement(self, name):
-        self._path = self._path[: -len(name) - 1]
+        self._path_names.pop()
 
 
 def xml_dialect(xml_path, xml_code):
@@ -71,28 +92,27 @@ def xml_dialect(xml_path, xml_code):
             if public_id_regex.match(public_id):
                 return dialect
 
+    # NOTE: Searching for a few substrings is considerably faster than parsing
+    #  XML code that cannot match any dialect anyway.
+    if not any(marker in xml_code for marker in _DIALECT_MARKERS):
+        return None
+
     xml_dialect_handler = XmlDialectHandler()
-    parser = xml.sax.make_parser()
-    parser.setContentHandler(xml_dialect_handler)
-    parser.setFeature(xml.sax.handler.feature_external_ges, False)
-    parser.setFeature(xml.sax.handler.feature_external_pes, False)
-    parser.setFeature(xml.sax.handler.feature_validation, False)
+    # NOTE: Using expat directly avoids the overhead of the SAX layer on top of
+    #  it, for example wrapping the attributes of each element. External
+    #  entities are not resolved because there is no ExternalEntityRefHandler.
+    parser = xml.parsers.expat.ParserCreate()
+    parser.StartElementHandler = xml_dialect_handler.startElement
+    parser.EndElementHandler = xml_dialect_handler.endElement
     try:
-        parser.feed(xml_code)
-        # NOTE: We can only call close() when the parser has finished,
-        # otherwise close() raises a SAXException('parser finished').
-        parser.close()
+        parser.Parse(xml_code, True)
     except SaxParserDone:
         # Language has been determined or the parser has given up.
         pass
-    except (ValueError, xml.sax.SAXException) as error:
-        # NOTE: ValueError is raised on unknown url type.
-        error_message = str(error)
-        message_without_path_match = _SAX_MESSAGE_WITHOUT_PATH_PATTERN.match(error_message)
-        if message_without_path_match is not None:
-            # HACK: Replace uninformative sax path like '<unknown>' with actual XML path.
-            error_message = xml_path + message_without_path_match.group("message_without_path")
-        _log.warning(error_message)
-    except OSError as error:
+    except xml.parsers.expat.ExpatError as error:
+        _log.warning("%s:%d:%d: %s", xml_path, error.lineno, error.offset, xml.parsers.expat.ErrorString(error.code))
+    except ValueError as error:
+        # NOTE: ValueError is raised if the code cannot be passed to expat, for
+        #  example because it contains surrogates that cannot be encoded.
         _log.warning("%s: cannot analyze XML dialect: %s", xml_path, error)
     return xml_dialect_handler.dialect
@@ -6,6 +6,7 @@ Common constants and functions used by multiple tests.
 # All rights reserved. Distributed under the BSD License.
 import os
 import shutil
+import tempfile
 import unittest
 from typing import Sequence, Union
 
@@ -13,10 +14,18 @@ PYGOUNT_PROJECT_FOLDER = os.path.dirname(os.path.dirname(__file__))
 PYGOUNT_SOURCE_FOLDER = os.path.join(PYGOUNT_PROJECT_FOLDER, "pygount")
 
 
+#: Folder containing the temporary folders of all tests.
+_TESTS_TEMP_ROOT_FOLDER = os.path.join(PYGOUNT_PROJECT_FOLDER, "tests", ".temp")
+
+
 class TempFolderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        os.makedirs(_TESTS_TEMP_ROOT_FOLDER, exist_ok=True)
+
     def setUp(self):
-        self.tests_temp_folder = os.path.join(PYGOUNT_PROJECT_FOLDER, "tests", ".temp")
-        os.makedirs(self.tests_temp_folder, exist_ok=True)
+        self.tests_temp_folder = tempfile.mkdtemp(dir=_TESTS_TEMP_ROOT_FOLDER)
 
     def create_temp_file(
         self, relative_target_path, content: Union[str, bytes, Sequence[str]], encoding="utf-8", do_create_folder=False
@@ -28,9 +37,7 @@ class TempFolderTest(unittest.TestCase):
             if isinstance(content, (str, bytes)):
                 target_file.write(content)
             else:
-                for line in content:
-                    target_file.write(line)
-                    target_file.write("\n")
+                target_file.write("".join(f"{line}\n" for line in content))
         return result
 
     def create_temp_binary_file(self, relative_target_path, content: bytes):
@@ -41,3 +48,8 @@ class TempFolderTest(unittest.TestCase):
 
     def tearDown(self):
         shutil.rmtree(self.tests_temp_folder)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(_TESTS_TEMP_ROOT_FOLDER, ignore_errors=True)
+        super().tearDownClass()
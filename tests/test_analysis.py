@@ -4,8 +4,10 @@ Tests for pygount source code analysis.
 
 # Copyright (c) 2016-2024, Thomas Aglassinger.
 # All rights reserved. Distributed under the BSD License.
-import glob
+import functools
+import itertools
 import os
+import re
 import unittest
 from io import BytesIO, StringIO
 from typing import List, Set
@@ -20,6 +22,7 @@ from pygount.analysis import (
     _delined_tokens,
     _line_parts,
     _pythonized_comments,
+    _token_type_mark,
     base_language,
     guess_lexer,
 )
@@ -27,63 +30,85 @@ from pygount.analysis import (
 from ._common import PYGOUNT_PROJECT_FOLDER, PYGOUNT_SOURCE_FOLDER, TempFolderTest
 from .test_xmldialect import EXAMPLE_ANT_CODE
 
+#: Maximum number of source paths to check in scanner tests that only need a sample.
+_MAX_SAMPLE_SOURCE_PATH_COUNT = 16
 
-class SourceScannerTest(TempFolderTest):
-    def setUp(self):
-        super().setUp()
-        self._tests_folder = os.path.dirname(__file__)
+_DEFAULT_GENERATED_REGEXES = common.regexes_from(analysis.DEFAULT_GENERATED_PATTERNS_TEXT)
+_FILE_HANDLE_MUST_BE_SEEKABLE_REGEX = re.compile(r".*file handle must be seekable.*")
 
-    def test_can_find_no_files(self):
-        scanner = analysis.SourceScanner([])
-        actual_paths = list(scanner.source_paths())
-        assert actual_paths == []
+#: Small Python source analyzed from in-memory file handles.
+_TEST_PY_CODE = "from random import randint\n\n# Print a random dice roll\nprint(randint(6))\n"
+_TEST_PY_BYTES = _TEST_PY_CODE.encode("utf-8")
 
-    def test_can_find_any_files(self):
-        scanner = analysis.SourceScanner([PYGOUNT_SOURCE_FOLDER])
-        actual_paths = list(scanner.source_paths())
-        assert actual_paths != []
 
-    def test_can_find_python_files(self):
-        scanner = analysis.SourceScanner([PYGOUNT_SOURCE_FOLDER], "py")
-        actual_paths = list(scanner.source_paths())
-        assert actual_paths != []
-        for python_path, _ in actual_paths:
-            actual_suffix = os.path.splitext(python_path)[1]
-            assert actual_suffix == ".py"
-
-    def test_can_skip_dot_folder(self):
-        project_folder_name = "project"
-        project_folder = os.path.join(self.tests_temp_folder, project_folder_name)
-        name_to_include = "include.py"
-        relative_path_to_include = os.path.join(project_folder_name, "include", name_to_include)
-        self.create_temp_file(relative_path_to_include, "include = 1", do_create_folder=True)
-        relative_path_to_skip = os.path.join(project_folder_name, ".skip", "skip.py")
-        self.create_temp_file(relative_path_to_skip, "skip = 2", do_create_folder=True)
-
-        scanner = analysis.SourceScanner([project_folder])
-        scanned_names = [os.path.basename(source_path) for source_path, _ in scanner.source_paths()]
-        assert scanned_names == [name_to_include]
-
-    def test_fails_on_non_repo_url(self):
-        non_repo_urls = [["https://github.com/roskakori/pygount/"], ["git@github.com:roskakori/pygount"]]
-        for non_repo_url in non_repo_urls:
-            with analysis.SourceScanner(non_repo_url) as scanner, pytest.raises(PygountError):
-                next(scanner.source_paths())
-
-    def test_can_find_python_files_in_dot(self):
-        scanner = analysis.SourceScanner(["."], "py")
+def _analysis_from_lines(source_path: str, source_lines: List[str]) -> analysis.SourceAnalysis:
+    # NOTE: Analyzing the code in memory avoids writing a temporary file for
+    #  tests that only depend on the name of the source.
+    source_code = "".join(f"{line}\n" for line in source_lines)
+    return analysis.SourceAnalysis.from_file(source_path, "test", file_handle=StringIO(source_code))
+
+
+@functools.lru_cache(maxsize=None)
+def _lexer_by_name(lexer_name: str):
+    # NOTE: Lexers do not change while tokenizing, so tests can share them.
+    return lexers.get_lexer_by_name(lexer_name)
+
+
+def test_can_skip_dot_folder(tmp_path):
+    project_folder = tmp_path / "project"
+    name_to_include = "include.py"
+    path_to_include = project_folder / "include" / name_to_include
+    path_to_include.parent.mkdir(parents=True)
+    path_to_include.write_text("include = 1\n", encoding="utf-8")
+    path_to_skip = project_folder / ".skip" / "skip.py"
+    path_to_skip.parent.mkdir(parents=True)
+    path_to_skip.write_text("skip = 2\n", encoding="utf-8")
+
+    scanner = analysis.SourceScanner([str(project_folder)])
+    scanned_names = [os.path.basename(source_path) for source_path, _ in scanner.source_paths()]
+    assert scanned_names == [name_to_include]
+
+
+def test_can_find_no_files():
+    scanner = analysis.SourceScanner([])
+    actual_paths = list(scanner.source_paths())
+    assert actual_paths == []
+
+
+def test_can_find_any_files():
+    scanner = analysis.SourceScanner([PYGOUNT_SOURCE_FOLDER])
+    assert next(scanner.source_paths(), None) is not None
+
+
+def test_can_find_python_files():
+    scanner = analysis.SourceScanner([PYGOUNT_SOURCE_FOLDER], "py")
+    actual_paths = list(itertools.islice(scanner.source_paths(), _MAX_SAMPLE_SOURCE_PATH_COUNT))
+    assert actual_paths != []
+    for python_path, _ in actual_paths:
+        assert python_path.endswith(".py")
+
+
+def test_fails_on_non_repo_url():
+    non_repo_urls = [["https://github.com/roskakori/pygount/"], ["git@github.com:roskakori/pygount"]]
+    for non_repo_url in non_repo_urls:
+        with analysis.SourceScanner(non_repo_url) as scanner, pytest.raises(PygountError):
+            next(scanner.source_paths())
+
+
+def test_can_find_python_files_in_dot():
+    scanner = analysis.SourceScanner(["."], "py")
+    actual_paths = list(itertools.islice(scanner.source_paths(), _MAX_SAMPLE_SOURCE_PATH_COUNT))
+    assert actual_paths != []
+    for python_path, _ in actual_paths:
+        assert python_path.endswith(".py")
+
+
+def test_can_find_files_from_mixed_cloned_git_remote_url_and_local():
+    git_remote_url = "https://github.com/roskakori/pygount.git"
+    with analysis.SourceScanner([git_remote_url, PYGOUNT_SOURCE_FOLDER]) as scanner:
         actual_paths = list(scanner.source_paths())
         assert actual_paths != []
-        for python_path, _ in actual_paths:
-            actual_suffix = os.path.splitext(python_path)[1]
-            assert actual_suffix == ".py"
-
-    def test_can_find_files_from_mixed_cloned_git_remote_url_and_local(self):
-        git_remote_url = "https://github.com/roskakori/pygount.git"
-        with analysis.SourceScanner([git_remote_url, PYGOUNT_SOURCE_FOLDER]) as scanner:
-            actual_paths = list(scanner.source_paths())
-            assert actual_paths != []
-            assert actual_paths[0][1] != actual_paths[-1][1]
+        assert actual_paths[0][1] != actual_paths[-1][1]
 
 
 class AnalysisTest(unittest.TestCase):
@@ -103,13 +128,23 @@ class AnalysisTest(unittest.TestCase):
             (token.Comment, " # c\n"),
         ]
 
+    def test_can_compute_token_type_mark(self):
+        assert _token_type_mark(token.Comment) == "d"
+        assert _token_type_mark(token.Comment.Single) == "d"
+        assert _token_type_mark(token.Comment.Preproc) == ""
+        assert _token_type_mark(token.Comment.PreprocFile) == ""
+        assert _token_type_mark(token.String) == "s"
+        assert _token_type_mark(token.String.Doc) == "s"
+        assert _token_type_mark(token.Name) == ""
+        assert _token_type_mark(token.Text) == ""
+
     def test_can_compute_python_line_parts(self):
-        python_lexer = lexers.get_lexer_by_name("python")
+        python_lexer = _lexer_by_name("python")
         assert list(_line_parts(python_lexer, "#")) == [set("d")]
         assert list(_line_parts(python_lexer, "s = 'x'  # x")) == [set("cds")]
 
     def test_can_detect_white_text(self):
-        python_lexer = lexers.get_lexer_by_name("python")
+        python_lexer = _lexer_by_name("python")
         assert list(_line_parts(python_lexer, "{[()]};")) == [set()]
         assert list(_line_parts(python_lexer, "pass")) == [set()]
 
@@ -117,14 +152,14 @@ class AnalysisTest(unittest.TestCase):
         source_code = (
             "#!/bin/python\n" '"Some tool."\n' "#(C) by me\n" "def x():\n" '    "Some function"\n' "    return 1"
         )
-        python_lexer = lexers.get_lexer_by_name("python")
+        python_lexer = _lexer_by_name("python")
         python_tokens = python_lexer.get_tokens(source_code)
         for token_type, _ in list(_pythonized_comments(_delined_tokens(python_tokens))):
             assert token_type not in token.String
 
     @staticmethod
     def _line_parts(lexer_name: str, source_lines: List[str]) -> List[Set[str]]:
-        lexer = lexers.get_lexer_by_name(lexer_name)
+        lexer = _lexer_by_name(lexer_name)
         source_code = "\n".join(source_lines)
         return list(_line_parts(lexer, source_code))
 
@@ -170,16 +205,6 @@ class FileAnalysisTest(TempFolderTest):
         assert source_analysis.state == analysis.SourceState.error
         assert "0x80" in str(source_analysis.state_info)
 
-    def test_can_detect_silent_dos_batch_remarks(self):
-        test_bat_path = self.create_temp_file(
-            "test_can_detect_silent_dos_batch_remarks.bat",
-            ["rem normal comment", "@rem silent comment", "echo some code"],
-        )
-        source_analysis = analysis.SourceAnalysis.from_file(test_bat_path, "test", encoding="utf-8")
-        assert source_analysis.language == "Batchfile"
-        assert source_analysis.code_count == 1
-        assert source_analysis.documentation_count == 2
-
     def test_fails_on_unknown_magic_encoding_comment(self):
         test_path = self.create_temp_file(
             "unknown_magic_encoding_comment.py", ["# -*- coding: no_such_encoding -*-", 'print("hello")']
@@ -191,31 +216,6 @@ class FileAnalysisTest(TempFolderTest):
         assert source_analysis.state == analysis.SourceState.error
         assert "unknown encoding" in str(source_analysis.state_info)
 
-    def test_can_analyze_oracle_sql(self):
-        test_oracle_sql_path = self.create_temp_file(
-            "some_oracle_sql.pls",
-            ["-- Oracle SQL example using an obscure suffix.", "select *", "from some_table;"],
-        )
-        source_analysis = analysis.SourceAnalysis.from_file(test_oracle_sql_path, "test", encoding="utf-8")
-        assert source_analysis.language.lower().endswith("sql")
-        assert source_analysis.code_count == 2
-        assert source_analysis.documentation_count == 1
-
-    def test_can_analyze_webfocus(self):
-        test_fex_path = self.create_temp_file(
-            "some.fex", ["-* comment", "-type some text", "table file some print * end;"]
-        )
-        source_analysis = analysis.SourceAnalysis.from_file(test_fex_path, "test", encoding="utf-8")
-        assert source_analysis.language == "WebFOCUS"
-        assert source_analysis.code_count == 2
-        assert source_analysis.documentation_count == 1
-
-    def test_can_analyze_xml_dialect(self):
-        build_xml_path = self.create_temp_file("build.xml", EXAMPLE_ANT_CODE)
-        source_analysis = analysis.SourceAnalysis.from_file(build_xml_path, "test")
-        assert source_analysis.state == analysis.SourceState.analyzed
-        assert source_analysis.language == "Ant"
-
     def test_can_analyze_unknown_language(self):
         unknown_language_path = self.create_temp_file("some.unknown_language", ["some", "lines", "of", "text"])
         source_analysis = analysis.SourceAnalysis.from_file(unknown_language_path, "test")
@@ -227,22 +227,6 @@ class FileAnalysisTest(TempFolderTest):
         assert source_analysis.state == analysis.SourceState.binary
         assert source_analysis.code_count == 0
 
-    def test_can_analyze_stringio(self):
-        test_path = "imaginary/path/to/file.py"
-        test_code = "from random import randint\n\n# Print a random dice roll\nprint(randint(6))\n"
-        source_analysis = analysis.SourceAnalysis.from_file(test_path, "test", file_handle=StringIO(test_code))
-        assert source_analysis.state == analysis.SourceState.analyzed
-        assert source_analysis.language == "Python"
-        assert source_analysis.code_count == 2
-
-    def test_can_analyze_bytesio(self):
-        test_path = "imaginary/path/to/file.py"
-        test_code = b"from random import randint\n\n# Print a random dice roll\nprint(randint(6))\n"
-        source_analysis = analysis.SourceAnalysis.from_file(test_path, "test", file_handle=BytesIO(test_code))
-        assert source_analysis.state == analysis.SourceState.analyzed
-        assert source_analysis.language == "Python"
-        assert source_analysis.code_count == 2
-
     def test_can_analyze_embedded_language(self):
         test_html_django_path = self.create_temp_file(
             "some.html",
@@ -263,17 +247,70 @@ class FileAnalysisTest(TempFolderTest):
         assert source_analysis.language.lower() == "html"
         assert source_analysis.code_count == 3
 
-    def test_fails_on_non_seekable_file_handle_with_encoding_automatic(self):
-        file_handle = _NonSeekableEmptyBytesIO()
 
-        with pytest.raises(PygountError, match=r".*file handle must be seekable.*"):
-            analysis.SourceAnalysis.from_file("README.md", "test", file_handle=file_handle, encoding="automatic")
+def test_can_detect_silent_dos_batch_remarks():
+    source_analysis = _analysis_from_lines(
+        "test_can_detect_silent_dos_batch_remarks.bat",
+        ["rem normal comment", "@rem silent comment", "echo some code"],
+    )
+    assert source_analysis.language == "Batchfile"
+    assert source_analysis.code_count == 1
+    assert source_analysis.documentation_count == 2
 
-    def test_fails_on_non_seekable_file_handle_with_encoding_chardet(self):
-        file_handle = _NonSeekableEmptyBytesIO()
 
-        with pytest.raises(PygountError, match=r".*file handle must be seekable.*"):
-            analysis.SourceAnalysis.from_file("README.md", "test", file_handle=file_handle, encoding="chardet")
+def test_can_analyze_oracle_sql():
+    source_analysis = _analysis_from_lines(
+        "some_oracle_sql.pls",
+        ["-- Oracle SQL example using an obscure suffix.", "select *", "from some_table;"],
+    )
+    assert source_analysis.language.lower().endswith("sql")
+    assert source_analysis.code_count == 2
+    assert source_analysis.documentation_count == 1
+
+
+def test_can_analyze_webfocus():
+    source_analysis = _analysis_from_lines(
+        "some.fex", ["-* comment", "-type some text", "table file some print * end;"]
+    )
+    assert source_analysis.language == "WebFOCUS"
+    assert source_analysis.code_count == 2
+    assert source_analysis.documentation_count == 1
+
+
+def test_can_analyze_xml_dialect():
+    source_analysis = analysis.SourceAnalysis.from_file("build.xml", "test", file_handle=StringIO(EXAMPLE_ANT_CODE))
+    assert source_analysis.state == analysis.SourceState.analyzed
+    assert source_analysis.language == "Ant"
+
+
+def test_can_analyze_stringio():
+    test_path = "imaginary/path/to/file.py"
+    source_analysis = analysis.SourceAnalysis.from_file(test_path, "test", file_handle=StringIO(_TEST_PY_CODE))
+    assert source_analysis.state == analysis.SourceState.analyzed
+    assert source_analysis.language == "Python"
+    assert source_analysis.code_count == 2
+
+
+def test_can_analyze_bytesio():
+    test_path = "imaginary/path/to/file.py"
+    source_analysis = analysis.SourceAnalysis.from_file(test_path, "test", file_handle=BytesIO(_TEST_PY_BYTES))
+    assert source_analysis.state == analysis.SourceState.analyzed
+    assert source_analysis.language == "Python"
+    assert source_analysis.code_count == 2
+
+
+def test_fails_on_non_seekable_file_handle_with_encoding_automatic():
+    file_handle = _NonSeekableEmptyBytesIO()
+
+    with pytest.raises(PygountError, match=_FILE_HANDLE_MUST_BE_SEEKABLE_REGEX):
+        analysis.SourceAnalysis.from_file("README.md", "test", file_handle=file_handle, encoding="automatic")
+
+
+def test_fails_on_non_seekable_file_handle_with_encoding_chardet():
+    file_handle = _NonSeekableEmptyBytesIO()
+
+    with pytest.raises(PygountError, match=_FILE_HANDLE_MUST_BE_SEEKABLE_REGEX):
+        analysis.SourceAnalysis.from_file("README.md", "test", file_handle=file_handle, encoding="chardet")
 
 
 def test_can_repr_source_analysis_from_file():
@@ -331,40 +368,21 @@ def test_can_guess_lexer_for_cmakelists():
     assert lexer.name == "CMake"
 
 
-class EncodingTest(TempFolderTest):
-    _ENCODING_TO_BOM_MAP = {encoding: bom for bom, encoding in _BOM_TO_ENCODING_MAP.items()}
-    _TEST_CODE = "x = '\u00fd \u20ac'"
-
-    def _test_can_detect_bom_encoding(self, encoding):
-        test_path = os.path.join(self.tests_temp_folder, encoding)
-        with open(test_path, "wb") as test_file:
-            if encoding != "utf-8-sig":
-                bom = EncodingTest._ENCODING_TO_BOM_MAP[encoding]
-                test_file.write(bom)
-            test_file.write(EncodingTest._TEST_CODE.encode(encoding))
-        actual_encoding = analysis.encoding_for(test_path)
-        assert actual_encoding == encoding
+_ENCODING_TO_BOM_MAP = {encoding: bom for bom, encoding in _BOM_TO_ENCODING_MAP.items()}
+_ENCODING_TEST_CODE = "x = '\u00fd \u20ac'"
 
-    def test_can_detect_bom_encodings(self):
-        for encoding in _BOM_TO_ENCODING_MAP.values():
-            self._test_can_detect_bom_encoding(encoding)
-
-    def test_can_detect_plain_encoding(self):
-        for encoding in ("cp1252", "utf-8"):
-            test_path = self.create_temp_file(encoding, EncodingTest._TEST_CODE, encoding)
-            actual_encoding = analysis.encoding_for(test_path)
-            assert actual_encoding == encoding
 
+class EncodingTest(TempFolderTest):
     def test_can_detect_xml_prolog(self):
         encoding = "iso-8859-15"
-        xml_code = f'<?xml encoding="{encoding}" standalone="yes"?><some>{EncodingTest._TEST_CODE}</some>'
+        xml_code = f'<?xml encoding="{encoding}" standalone="yes"?><some>{_ENCODING_TEST_CODE}</some>'
         test_path = self.create_temp_file(encoding + ".xml", xml_code, encoding)
         actual_encoding = analysis.encoding_for(test_path)
         assert actual_encoding == encoding
 
     def test_can_detect_magic_comment(self):
         encoding = "iso-8859-15"
-        lines = ["#!/usr/bin/python", f"# -*- coding: {encoding} -*-", EncodingTest._TEST_CODE]
+        lines = ["#!/usr/bin/python", f"# -*- coding: {encoding} -*-", _ENCODING_TEST_CODE]
         test_path = self.create_temp_file("magic-" + encoding, lines, encoding)
         actual_encoding = analysis.encoding_for(test_path)
         assert actual_encoding == encoding
@@ -374,11 +392,6 @@ class EncodingTest(TempFolderTest):
         actual_encoding = analysis.encoding_for(test_path)
         assert actual_encoding == "utf-8"
 
-    def test_can_detect_chardet_encoding(self):
-        test_path = __file__
-        actual_encoding = analysis.encoding_for(test_path)
-        assert actual_encoding == "utf-8"
-
     def test_can_detect_utf8_when_cp1252_would_fail(self):
         # Write closing double quote in UTF-8, which contains 0x9d,
         # which fails when read as CP1252.
@@ -406,6 +419,32 @@ class EncodingTest(TempFolderTest):
         assert not analysis.is_binary_file(test_path)
 
 
+@pytest.mark.parametrize("encoding", list(_BOM_TO_ENCODING_MAP.values()))
+def test_can_detect_bom_encoding(tmp_path, encoding):
+    test_path = tmp_path / encoding
+    with open(test_path, "wb") as test_file:
+        if encoding != "utf-8-sig":
+            bom = _ENCODING_TO_BOM_MAP[encoding]
+            test_file.write(bom)
+        test_file.write(_ENCODING_TEST_CODE.encode(encoding))
+    actual_encoding = analysis.encoding_for(str(test_path))
+    assert actual_encoding == encoding
+
+
+@pytest.mark.parametrize("encoding", ["cp1252", "utf-8"])
+def test_can_detect_plain_encoding(tmp_path, encoding):
+    test_path = tmp_path / encoding
+    test_path.write_text(_ENCODING_TEST_CODE, encoding=encoding)
+    actual_encoding = analysis.encoding_for(str(test_path))
+    assert actual_encoding == encoding
+
+
+def test_can_detect_chardet_encoding():
+    test_path = __file__
+    actual_encoding = analysis.encoding_for(test_path)
+    assert actual_encoding == "utf-8"
+
+
 class GeneratedCodeTest(TempFolderTest):
     _STANDARD_SOURCE_LINES = """#!/bin/python3
     # Example code for
@@ -417,10 +456,9 @@ class GeneratedCodeTest(TempFolderTest):
     )
 
     def test_can_detect_non_generated_code(self):
-        default_generated_regexes = common.regexes_from(analysis.DEFAULT_GENERATED_PATTERNS_TEXT)
         with open(__file__, encoding="utf-8") as source_file:
             matching_line_number_and_regex = analysis.matching_number_line_and_regex(
-                source_file, default_generated_regexes
+                source_file, _DEFAULT_GENERATED_REGEXES
             )
         assert matching_line_number_and_regex is None
 
@@ -449,17 +487,19 @@ class GeneratedCodeTest(TempFolderTest):
         assert source_analysis.state == analysis.SourceState.generated
 
 
-class SizeTest(TempFolderTest):
-    def test_can_detect_empty_source_code(self):
-        empty_py_path = self.create_temp_binary_file("empty.py", b"")
-        source_analysis = analysis.SourceAnalysis.from_file(empty_py_path, "test", encoding="utf-8")
-        assert source_analysis.state == analysis.SourceState.empty
-        assert source_analysis.code_count == 0
+def test_can_detect_empty_source_code(tmp_path):
+    empty_py_path = tmp_path / "empty.py"
+    empty_py_path.write_bytes(b"")
+    source_analysis = analysis.SourceAnalysis.from_file(str(empty_py_path), "test", encoding="utf-8")
+    assert source_analysis.state == analysis.SourceState.empty
+    assert source_analysis.code_count == 0
 
 
 def test_can_analyze_project_markdown_files():
     project_root_folder = os.path.dirname(PYGOUNT_PROJECT_FOLDER)
-    for text_path in glob.glob(os.path.join(project_root_folder, "*.md")):
+    with os.scandir(project_root_folder) as entries:
+        text_paths = [entry.path for entry in entries if entry.name.endswith(".md") and entry.is_file()]
+    for text_path in text_paths:
         source_analysis = analysis.SourceAnalysis.from_file(text_path, "test")
         assert source_analysis.state == analysis.SourceState.analyzed
         assert source_analysis.documentation_count > 0
@@ -470,16 +510,11 @@ def test_has_no_duplicate_in_pygount_source():
     duplicate_pool = analysis.DuplicatePool()
     source_paths = []
     for sub_folder_name in ("pygount", "tests"):
-        source_paths.extend(
-            [
-                os.path.join(PYGOUNT_PROJECT_FOLDER, sub_folder_name, source_name)
-                for source_name in os.listdir(os.path.join(PYGOUNT_PROJECT_FOLDER, sub_folder_name))
-            ]
-        )
+        with os.scandir(os.path.join(PYGOUNT_PROJECT_FOLDER, sub_folder_name)) as entries:
+            source_paths.extend(entry.path for entry in entries if entry.name.endswith(".py"))
     for source_path in source_paths:
-        if source_path.endswith(".py"):
-            duplicate_path = duplicate_pool.duplicate_path(source_path)
-            assert duplicate_path is None, f"{source_path} must not be duplicate of {duplicate_path}"
+        duplicate_path = duplicate_pool.duplicate_path(source_path)
+        assert duplicate_path is None, f"{source_path} must not be duplicate of {duplicate_path}"
 
 
 def test_can_compute_base_language():
@@ -491,18 +526,22 @@ def test_can_compute_base_language():
     assert base_language("") == ""  # no actual language, but should not crash either
 
 
-class DuplicatePoolTest(TempFolderTest):
-    def test_can_distinguish_different_files(self):
-        some_path = self.create_temp_file(__name__ + "_some", "some")
-        other_path = self.create_temp_file(__name__ + "_other", "other")
-        duplicate_pool = analysis.DuplicatePool()
-        assert duplicate_pool.duplicate_path(some_path) is None
-        assert duplicate_pool.duplicate_path(other_path) is None
-
-    def test_can_detect_duplicate(self):
-        same_content = "same"
-        original_path = self.create_temp_file("original", same_content)
-        duplicate_path = self.create_temp_file("duplicate", same_content)
-        duplicate_pool = analysis.DuplicatePool()
-        assert duplicate_pool.duplicate_path(original_path) is None
-        assert original_path == duplicate_pool.duplicate_path(duplicate_path)
+def test_can_distinguish_different_files(tmp_path):
+    some_path = tmp_path / "some"
+    some_path.write_text("some", encoding="utf-8")
+    other_path = tmp_path / "other"
+    other_path.write_text("other", encoding="utf-8")
+    duplicate_pool = analysis.DuplicatePool()
+    assert duplicate_pool.duplicate_path(str(some_path)) is None
+    assert duplicate_pool.duplicate_path(str(other_path)) is None
+
+
+def test_can_detect_duplicate(tmp_path):
+    same_content = "same"
+    original_path = tmp_path / "original"
+    original_path.write_text(same_content, encoding="utf-8")
+    duplicate_path = tmp_path / "duplicate"
+    duplicate_path.write_text(same_content, encoding="utf-8")
+    duplicate_pool = analysis.DuplicatePool()
+    assert duplicate_pool.duplicate_path(str(original_path)) is None
+    assert str(original_path) == duplicate_pool.duplicate_path(str(duplicate_path))
@@ -4,6 +4,10 @@ Tests to summarize analyses of multiple source codes.
 
 # Copyright (c) 2016-2024, Thomas Aglassinger.
 # All rights reserved. Distributed under the BSD License.
+import array
+
+import pytest
+
 from pygount.analysis import SourceAnalysis, SourceState
 from pygount.summary import LanguageSummary, ProjectSummary
 
@@ -19,6 +23,17 @@ def test_can_repr_language_summary():
     assert repr(language_summary) == str(language_summary)
 
 
+class _LanguageText(str):
+    # Subclass of str similar to numpy.str_, which sys.intern() rejects.
+    pass
+
+
+def test_can_summarize_language_from_str_subclass():
+    language_summary = LanguageSummary(_LanguageText("Python"))
+    assert type(language_summary.language) is str
+    assert language_summary.language == "Python"
+
+
 def test_can_repr_pseudo_language_summary():
     language_summary = LanguageSummary("__empty__")
     language_summary.add(SourceAnalysis("some.py", "__empty__", "some", 0, 0, 0, 0, SourceState.empty))
@@ -97,3 +112,118 @@ def test_can_repr_empty_project_summary():
     project_summary = ProjectSummary()
     assert repr(project_summary) == "ProjectSummary(total_file_count=0, total_line_count=0, languages=[])"
     assert repr(project_summary) == str(project_summary)
+
+
+def test_can_summarize_project_with_many_files_at_once():
+    source_analyses = (
+        SourceAnalysis("some.py", "Python", "some", 1000, 100, 10, 3, SourceState.analyzed),
+        SourceAnalysis("other.py", "Python", "some", 300, 30, 3, 1, SourceState.analyzed),
+        SourceAnalysis("some.sh", "Bash", "some", 200, 20, 5, 2, SourceState.analyzed),
+        SourceAnalysis("generated.py", "__generated__", "some", 1, 2, 3, 4, SourceState.generated, "generated by test"),
+    )
+    expected_project_summary = ProjectSummary()
+    for source_analysis in source_analyses:
+        expected_project_summary.add(source_analysis)
+
+    project_summary = ProjectSummary()
+    project_summary.add_many(source_analyses)
+
+    assert repr(project_summary) == repr(expected_project_summary)
+    assert project_summary.total_code_count == 1500
+    assert project_summary.total_documentation_count == 150
+    assert project_summary.total_empty_count == 18
+    assert project_summary.total_string_count == 6
+    for language, language_summary in project_summary.language_to_language_summary_map.items():
+        assert repr(language_summary) == repr(expected_project_summary.language_to_language_summary_map[language])
+
+
+def test_can_summarize_project_from_arrays():
+    project_summary = ProjectSummary.from_arrays(
+        code_counts=[1000, 300, 200, 1],
+        documentation_counts=[100, 30, 20, 2],
+        empty_counts=[10, 3, 5, 3],
+        string_counts=[3, 1, 2, 4],
+        countables=[True, True, True, False],
+        languages=["Python", "Python", "Bash", "__generated__"],
+    )
+
+    assert set(project_summary.language_to_language_summary_map.keys()) == {"Bash", "Python", "__generated__"}
+    assert project_summary.total_file_count == 4
+    assert project_summary.total_code_count == 1500
+    assert project_summary.total_documentation_count == 150
+    assert project_summary.total_empty_count == 18
+    assert project_summary.total_string_count == 6
+    python_summary = project_summary.language_to_language_summary_map["Python"]
+    assert python_summary.file_count == 2
+    assert python_summary.code_count == 1300
+    generated_summary = project_summary.language_to_language_summary_map["__generated__"]
+    assert generated_summary.file_count == 1
+    assert generated_summary.code_count == 0
+
+
+def test_can_summarize_project_from_array_likes():
+    project_summary = ProjectSummary.from_arrays(
+        code_counts=array.array("q", [1000, 300, 1]),
+        documentation_counts=array.array("q", [100, 30, 2]),
+        empty_counts=array.array("q", [10, 3, 3]),
+        string_counts=array.array("q", [3, 1, 4]),
+        countables=array.array("b", [1, 1, 0]),
+        languages=(_LanguageText("Python"), _LanguageText("Python"), _LanguageText("__generated__")),
+    )
+
+    assert set(project_summary.language_to_language_summary_map.keys()) == {"Python", "__generated__"}
+    assert project_summary.total_file_count == 3
+    assert project_summary.total_code_count == 1300
+    assert project_summary.total_line_count == 1447
+
+
+def test_fails_on_project_from_arrays_with_different_lengths():
+    with pytest.raises(ValueError, match=r"^empty_counts must have the same length as languages \(2\) but has 1$"):
+        ProjectSummary.from_arrays(
+            code_counts=[1, 2],
+            documentation_counts=[1, 2],
+            empty_counts=[1],
+            string_counts=[1, 2],
+            countables=[True, True],
+            languages=["Python", "Python"],
+        )
+
+
+def test_can_compute_percentages():
+    project_summary = ProjectSummary()
+    assert project_summary.total_code_percentage == 0.0
+    assert project_summary.total_source_percentage == 0.0
+
+    project_summary.add(SourceAnalysis("some.py", "Python", "some", 50, 25, 15, 10, SourceState.analyzed))
+    project_summary.add(SourceAnalysis("empty.py", "__empty__", "some", 0, 0, 0, 0, SourceState.empty))
+    project_summary.update_file_percentages()
+    assert project_summary.total_code_percentage == 50.0
+    assert project_summary.total_documentation_percentage == 25.0
+    assert project_summary.total_empty_percentage == 15.0
+    assert project_summary.total_string_percentage == 10.0
+    assert project_summary.total_source_percentage == 60.0
+
+    python_summary = project_summary.language_to_language_summary_map["Python"]
+    assert python_summary.code_percentage == 50.0
+    assert python_summary.source_percentage == 60.0
+    assert python_summary.file_percentage == 50.0
+    empty_summary = project_summary.language_to_language_summary_map["__empty__"]
+    assert empty_summary.code_percentage == 0.0
+    assert empty_summary.file_percentage == 50.0
+
+
+def test_can_repr_summaries_after_adding_more():
+    project_summary = ProjectSummary()
+    assert repr(project_summary) == "ProjectSummary(total_file_count=0, total_line_count=0, languages=[])"
+    project_summary.add(SourceAnalysis("some.py", "Python", "some", 1, 2, 3, 4, SourceState.analyzed))
+    python_summary = project_summary.language_to_language_summary_map["Python"]
+    assert repr(python_summary) == (
+        "LanguageSummary(language='Python', file_count=1, "
+        "code_count=1, documentation_count=2, empty_count=3, string_count=4)"
+    )
+    project_summary.add_many([SourceAnalysis("other.py", "Python", "some", 10, 20, 30, 40, SourceState.analyzed)])
+    assert repr(project_summary) == "ProjectSummary(total_file_count=2, total_line_count=110, languages=['Python'])"
+    assert repr(python_summary) == (
+        "LanguageSummary(language='Python', file_count=2, "
+        "code_count=11, documentation_count=22, empty_count=33, string_count=44)"
+    )
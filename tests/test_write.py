@@ -5,6 +5,8 @@ Test to write results of pygount analyses.
 # Copyright (c) 2016-2024, Thomas Aglassinger.
 # All rights reserved. Distributed under the BSD License.
 import io
+import json
+import os
 import re
 import tempfile
 from pathlib import Path
@@ -33,6 +35,34 @@ def test_can_collect_totals():
     assert writer.lines_per_second > writer.files_per_second
 
 
+def test_can_write_lines():
+    source_analyses = (
+        analysis.SourceAnalysis("some.py", "Python", "some", 1, 2, 3, 4, analysis.SourceState.analyzed, None),
+        analysis.SourceAnalysis("other.sh", "Bash", "other", 10, 20, 30, 40, analysis.SourceState.analyzed, None),
+    )
+    with io.StringIO() as target_stream:
+        with write.LineWriter(target_stream) as writer:
+            for source_analysis in source_analyses:
+                writer.add(source_analysis)
+        lines = target_stream.getvalue().split(os.linesep)
+    assert lines == ["5\tPython\tsome\tsome.py", "50\tBash\tother\tother.sh", ""]
+
+
+def test_can_write_more_lines_than_lines_per_write(monkeypatch):
+    monkeypatch.setattr(write.LineWriter, "LINES_PER_WRITE", 2)
+    with io.StringIO() as target_stream:
+        with write.LineWriter(target_stream) as writer:
+            for index in range(5):
+                writer.add(
+                    analysis.SourceAnalysis(
+                        f"some_{index}.py", "Python", "some", index, 0, 0, 0, analysis.SourceState.analyzed, None
+                    )
+                )
+            assert target_stream.getvalue().count(os.linesep) == 4
+        lines = target_stream.getvalue().split(os.linesep)
+    assert lines == [f"{index}\tPython\tsome\tsome_{index}.py" for index in range(5)] + [""]
+
+
 def test_can_write_cloc_xml():
     source_analyses = (
         analysis.SourceAnalysis("some.py", "Python", "some", 1, 2, 3, 4, analysis.SourceState.analyzed, None),
@@ -51,12 +81,145 @@ def test_can_write_cloc_xml():
     assert len(file_elements) == len(source_analyses)
 
 
+def test_can_write_cloc_xml_file_with_header_and_total():
+    source_analyses = (
+        analysis.SourceAnalysis("some.py", "Python", "some", 1, 2, 3, 4, analysis.SourceState.analyzed, None),
+        analysis.SourceAnalysis("other.py", "Python", "some", 10, 20, 30, 40, analysis.SourceState.analyzed, None),
+    )
+    with tempfile.TemporaryDirectory(prefix="pygount_") as temp_folder:
+        cloc_xml_path = Path(temp_folder, "cloc.xml")
+        with cloc_xml_path.open("w", encoding="utf-8") as target_stream, write.ClocXmlWriter(target_stream) as writer:
+            for source_analysis in source_analyses:
+                writer.add(source_analysis)
+        assert cloc_xml_path.read_text("utf-8").startswith('<?xml version="1.0" encoding="utf-8"?>')
+        cloc_results_root = ElementTree.parse(cloc_xml_path)
+    assert cloc_results_root.find("header/cloc_url").text == "https://github.com/roskakori/pygount"
+    assert cloc_results_root.find("header/n_files").text == "2"
+    assert cloc_results_root.find("header/n_lines").text == "110"
+    assert [element.tag for element in cloc_results_root.getroot()] == ["header", "files"]
+    file_element = cloc_results_root.find("files/file")
+    assert file_element.attrib == {"blank": "3", "code": "5", "comment": "2", "language": "Python", "name": "some.py"}
+    total_element = cloc_results_root.find("files/total")
+    assert total_element.attrib == {"blank": "33", "code": "55", "comment": "22"}
+
+
+def test_can_write_cloc_xml_with_spooled_files(monkeypatch):
+    monkeypatch.setattr(write, "_CLOC_XML_FILES_MAX_MEMORY_SIZE", 1)
+    paths = [f"some_{index}.py" for index in range(3)]
+    with io.StringIO() as target_stream:
+        with write.ClocXmlWriter(target_stream) as writer:
+            for path in paths:
+                writer.add(
+                    analysis.SourceAnalysis(path, "Python", "some", 1, 2, 3, 4, analysis.SourceState.analyzed, None)
+                )
+            assert target_stream.getvalue() == ""
+        cloc_results_root = ElementTree.fromstring(target_stream.getvalue())
+    assert [file_element.get("name") for file_element in cloc_results_root.findall("files/file")] == paths
+
+
+class _TextChunksStream:
+    # Minimal text stream that is not derived from io.TextIOBase.
+    def __init__(self, name: str):
+        self.name = name
+        self.encoding = "utf-8"
+        self.chunks = []
+
+    def write(self, text):
+        self.chunks.append(text)
+
+
+def test_can_write_cloc_xml_to_any_text_stream():
+    target_stream = _TextChunksStream("<report & summary>.xml")
+    writer = write.ClocXmlWriter(target_stream)
+    writer.add(analysis.SourceAnalysis("some.py", "Python", "some", 1, 2, 3, 4, analysis.SourceState.analyzed, None))
+    writer.close()
+    writer.close()  # Must not write anything again.
+    assert all(isinstance(chunk, str) for chunk in target_stream.chunks)
+    xml_text = "".join(target_stream.chunks)
+    assert xml_text.startswith('<?xml version="1.0" encoding="utf-8"?><results><header>')
+    cloc_results_root = ElementTree.fromstring(xml_text.encode("utf-8"))
+    assert cloc_results_root.find("header/report_file").text == "<report & summary>.xml"
+    assert len(cloc_results_root.findall("files/file")) == 1
+
+
+def test_can_write_cloc_xml_with_escaped_attributes():
+    source_analysis = analysis.SourceAnalysis(
+        'some "&" <other>.txt', "C<++>", "some", 1, 2, 3, 4, analysis.SourceState.analyzed, None
+    )
+    with io.StringIO() as target_stream:
+        with write.ClocXmlWriter(target_stream) as writer:
+            writer.add(source_analysis)
+        cloc_results_root = ElementTree.fromstring(target_stream.getvalue())
+    file_element = cloc_results_root.find("files/file")
+    assert file_element.get("language") == "C<++>"
+    assert file_element.get("name") == 'some "&" <other>.txt'
+
+
+def test_can_write_json():
+    source_analyses = (
+        analysis.SourceAnalysis("some.py", "Python", "some", 1, 2, 3, 4, analysis.SourceState.analyzed, None),
+        analysis.SourceAnalysis("other.py", "Python", "some", 10, 20, 30, 40, analysis.SourceState.analyzed, None),
+    )
+    with io.StringIO() as target_stream:
+        with write.JsonWriter(target_stream) as writer:
+            for source_analysis in source_analyses:
+                writer.add(source_analysis)
+        json_map = json.loads(target_stream.getvalue())
+    assert json_map["formatVersion"] == write.JSON_FORMAT_VERSION
+    assert [file_map["path"] for file_map in json_map["files"]] == ["some.py", "other.py"]
+    assert json_map["files"][1]["lineCount"] == 100
+    assert json_map["files"][1]["sourceCount"] == 50
+    assert [language_map["language"] for language_map in json_map["languages"]] == ["Python"]
+    assert json_map["summary"]["totalFileCount"] == 2
+
+
+def test_can_write_json_with_non_ascii_and_surrogate_paths():
+    # NOTE: On POSIX, file names that are not valid UTF-8 contain surrogates.
+    paths = ["\N{EURO SIGN}uro.py", "bad_\udcff_name.py"]
+    source_analyses = [
+        analysis.SourceAnalysis(path, "Python", "some", 1, 2, 3, 4, analysis.SourceState.analyzed, None)
+        for path in paths
+    ]
+    with io.StringIO() as target_stream:
+        with write.JsonWriter(target_stream) as writer:
+            for source_analysis in source_analyses:
+                writer.add(source_analysis)
+        json_text = target_stream.getvalue()
+    assert json_text.isascii()
+    json_map = json.loads(json_text)
+    assert [file_map["path"] for file_map in json_map["files"]] == paths
+
+
+def test_can_track_progress_only_for_json_written_to_file(monkeypatch):
+    with io.StringIO() as target_stream:
+        assert write.JsonWriter(target_stream).has_to_track_progress
+        monkeypatch.setattr("sys.stdout", target_stream)
+        assert not write.JsonWriter(target_stream).has_to_track_progress
+
+
+def test_can_write_json_without_files():
+    with io.StringIO() as target_stream:
+        with write.JsonWriter(target_stream):
+            pass
+        json_map = json.loads(target_stream.getvalue())
+    assert json_map["files"] == []
+    assert json_map["languages"] == []
+
+
 def test_can_compute_digit_width():
     assert write.digit_width(0) == 1
     assert write.digit_width(1) == 1
     assert write.digit_width(9) == 1
     assert write.digit_width(999) == 3
     assert write.digit_width(1000) == 4
+    assert write.digit_width(10**20 - 1) == 20
+
+
+def test_can_format_percentage():
+    assert write.formatted_percentage(0.0) == "0.0"
+    assert write.formatted_percentage(0.05) == "0.1"
+    assert write.formatted_percentage(66.66666) == "66.7"
+    assert write.formatted_percentage(100.0) == "100.0"
 
 
 _LINE_WORD_REGEX = re.compile(r"[\w\\.]+")  # HACK: For test assume all language names are "\w+".
@@ -56,8 +56,15 @@ def test_can_detect_maven():
     assert pygount.xmldialect.xml_dialect("<maven>", _EXAMPLE_POM_CODE) == "Maven"
 
 
-def test_can_ignore_broken_xml():
+def test_can_ignore_broken_xml(caplog):
+    assert pygount.xmldialect.xml_dialect("<broken>", "<project></other>") is None
+    assert caplog.messages == ["<broken>:1:11: mismatched tag"]
+
+
+def test_can_skip_xml_without_dialect_markers(caplog):
+    assert pygount.xmldialect.xml_dialect("<some>", "<some><other/></some>") is None
     assert pygount.xmldialect.xml_dialect("<broken>", "<some></other>") is None
+    assert caplog.messages == []
 
 
 def test_can_detect_docbook_from_dtd():